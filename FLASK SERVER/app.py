@@ -1,10 +1,18 @@
-from flask import Flask, render_template, jsonify, request, send_file
+from flask import Flask, render_template, stream_template, jsonify, request, send_file, send_from_directory, url_for, abort
 import json
 import os
 import re
+import bisect
+import tempfile
+import mimetypes
+import time
+import threading
 import openpyxl
+import build_assets
+from functools import wraps
 from io import BytesIO
-from datetime import datetime
+from datetime import datetime, timedelta
+from markupsafe import Markup
 from werkzeug.utils import secure_filename
 
 app = Flask(__name__)
@@ -14,6 +22,13 @@ CONTACTS_FILE = "data.json"
 DEPARTMENTS_FILE = "departments.json"
 ASSIGNMENTS_FILE = "assignments.json"
 CV_FOLDER = "cv_files"
+EXPORT_CACHE_TTL = 30  # seconds an export artifact is reused for the same data version
+EXPORT_CONCURRENCY = 2  # workbooks built at the same time, for different data versions
+PAGE_SIZE = 50  # table rows rendered by the server, the rest are fetched by the page scripts
+HISTORY_FOLDER = "history"
+HISTORY_TRASH_FOLDER = os.path.join(HISTORY_FOLDER, "cv_trash")
+HISTORY_MAX_BYTES = 1024 * 1024  # start a new history file after this size
+HISTORY_FILES_KEPT = 5  # older history files, and the CVs they reference, are dropped
 
 # Ensure required directories and files exist
 if not os.path.exists(CV_FOLDER):
@@ -22,6 +37,20 @@ if not os.path.exists(CV_FOLDER):
 
 # ==================== DATA MANAGEMENT FUNCTIONS ====================
 
+def write_json_atomic(path, data):
+    """Write JSON to a temp file and swap it in, so readers never see a partial file"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=4)
+        os.chmod(tmp_path, os.stat(path).st_mode if os.path.exists(path) else 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
 def load_data():
     """Load contacts data from JSON file"""
     if os.path.exists(CONTACTS_FILE):
@@ -36,8 +65,7 @@ def load_data():
 def save_data(data):
     """Save contacts data to JSON file"""
     data = sorted(data, key=lambda x: x["name"].lower())
-    with open(CONTACTS_FILE, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=4)
+    write_json_atomic(CONTACTS_FILE, data)
 
 
 def load_departments():
@@ -54,8 +82,7 @@ def load_departments():
 def save_departments(data):
     """Save departments data to JSON file"""
     data = sorted(data, key=lambda x: x["name"].lower())
-    with open(DEPARTMENTS_FILE, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=4)
+    write_json_atomic(DEPARTMENTS_FILE, data)
 
 
 def load_assignments():
@@ -70,8 +97,375 @@ def load_assignments():
 
 def save_assignments(data):
     """Save assignments data to JSON file"""
-    with open(ASSIGNMENTS_FILE, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=4)
+    write_json_atomic(ASSIGNMENTS_FILE, data)
+
+
+# ==================== REQUEST COALESCING & ADMISSION CONTROL ====================
+
+_inflight_lock = threading.Lock()
+_inflight = {}  # key -> {"event": Event, "result": ..., "error": ...}
+
+_export_cache_lock = threading.Lock()
+_export_cache = {}  # data version -> (created_at, xlsx bytes)
+_export_slots = threading.BoundedSemaphore(EXPORT_CONCURRENCY)
+_data_write_lock = threading.Lock()
+
+
+class ServerBusy(Exception):
+    """Raised when an expensive build cannot start because all its slots are taken"""
+
+    def __init__(self, retry_after=2):
+        super().__init__("Server busy, please retry shortly")
+        self.retry_after = retry_after
+
+
+def get_data_version():
+    """Return a version key that changes whenever any data file is rewritten.
+
+    The inode is part of the key, since an atomic replace within the same
+    mtime tick can leave mtime and size unchanged.
+    """
+    version = []
+    for file in [CONTACTS_FILE, DEPARTMENTS_FILE, ASSIGNMENTS_FILE]:
+        try:
+            st = os.stat(file)
+            version.append((st.st_ino, st.st_mtime_ns, st.st_size))
+        except OSError:
+            version.append(None)
+    return tuple(version)
+
+
+def single_flight(key, compute):
+    """Run compute() once for concurrent callers with the same key and share the result"""
+    with _inflight_lock:
+        call = _inflight.get(key)
+        leader = call is None
+        if leader:
+            call = {"event": threading.Event(), "result": None, "error": None}
+            _inflight[key] = call
+
+    if not leader:
+        call["event"].wait()
+        if call["error"] is not None:
+            raise call["error"]
+        return call["result"]
+
+    try:
+        call["result"] = compute()
+        return call["result"]
+    except Exception as e:
+        call["error"] = e
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+        call["event"].set()
+
+
+def get_cached_export(version, build):
+    """Return export bytes for this data version, building them at most once per TTL.
+
+    Cache hits and requests joining an in-flight build never take a slot, only the
+    request that actually builds does. Raises ServerBusy when no slot is free.
+    """
+    now = time.monotonic()
+    with _export_cache_lock:
+        cached = _export_cache.get(version)
+        if cached and now - cached[0] < EXPORT_CACHE_TTL:
+            return cached[1]
+
+    def build_with_slot():
+        if not _export_slots.acquire(blocking=False):
+            raise ServerBusy()
+        try:
+            return build()
+        finally:
+            _export_slots.release()
+
+    content = single_flight(("export", version), build_with_slot)
+
+    with _export_cache_lock:
+        # Old versions are never requested again, keep only the current one
+        _export_cache.clear()
+        _export_cache[version] = (now, content)
+    return content
+
+
+def busy_response(retry_after):
+    """429 response telling the client when to retry"""
+    response = jsonify({"error": "Server busy, please retry shortly"})
+    response.status_code = 429
+    response.headers["Retry-After"] = str(retry_after)
+    return response
+
+
+def concurrency_limit(max_concurrent, retry_after=2):
+    """Reject requests with 429 once max_concurrent are already running on this endpoint"""
+    def decorator(view):
+        slots = threading.BoundedSemaphore(max_concurrent)
+
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if not slots.acquire(blocking=False):
+                return busy_response(retry_after)
+            try:
+                return view(*args, **kwargs)
+            finally:
+                slots.release()
+        return wrapper
+    return decorator
+
+
+def serialized_write(view):
+    """Run a view that rewrites the data files under one shared lock, so concurrent edits are not lost"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        with _data_write_lock:
+            return view(*args, **kwargs)
+    return wrapper
+
+
+# ==================== FRAGMENT CACHE ====================
+
+_fragment_cache_lock = threading.Lock()
+_fragment_cache = {}  # (fragment name, data version) -> dict of rendered HTML and row counts
+
+
+def get_cached_fragment(name, version, render):
+    """Return what render() built for a fragment, rendering it once per data version.
+
+    render() returns a dict, so row counts are cached next to the HTML and a cache
+    hit does not need to load the data at all.
+    """
+    key = (name, version)
+    with _fragment_cache_lock:
+        fragment = _fragment_cache.get(key)
+    if fragment is not None:
+        return fragment
+
+    fragment = single_flight(("fragment",) + key, render)
+
+    with _fragment_cache_lock:
+        # Drop fragments rendered from older data
+        for cached_key in [k for k in _fragment_cache if k[0] == name and k[1] != version]:
+            del _fragment_cache[cached_key]
+        _fragment_cache[key] = fragment
+    return fragment
+
+
+# ==================== STATIC ASSETS ====================
+
+ASSET_MAX_AGE = 31536000  # one year, safe because built asset names carry a content hash
+_asset_manifest = {"mtime": None, "files": {}}
+
+
+def load_asset_manifest():
+    """Load the build manifest, reloading it only when build_assets.py rewrites it"""
+    try:
+        mtime = os.path.getmtime(build_assets.MANIFEST_FILE)
+    except OSError:
+        _asset_manifest.update(mtime=None, files={})
+        return {}
+    if mtime != _asset_manifest["mtime"]:
+        with open(build_assets.MANIFEST_FILE, "r", encoding="utf-8") as f:
+            _asset_manifest.update(mtime=mtime, files=json.load(f))
+    return _asset_manifest["files"]
+
+
+@app.context_processor
+def inject_asset_urls():
+    """Expose asset_urls() so templates link built bundles, or the plain files when not built"""
+    def asset_urls(bundle):
+        hashed = load_asset_manifest().get(bundle)
+        if hashed:
+            return [url_for("assets", filename=hashed)]
+        return [url_for("static", filename=source) for source in build_assets.BUNDLES[bundle]]
+    return {"asset_urls": asset_urls}
+
+
+@app.route("/assets/<path:filename>")
+def assets(filename):
+    """Serve built assets, preferring precompressed variants, with immutable caching"""
+    # Pick the highest q-value the client allows, brotli wins a tie
+    encoding = None
+    best_quality = 0
+    for ext, name in [(".br", "br"), (".gz", "gzip")]:
+        quality = request.accept_encodings.quality(name)
+        if quality > best_quality and os.path.isfile(os.path.join(build_assets.DIST_FOLDER, filename + ext)):
+            encoding, best_quality = name, quality
+
+    if not os.path.isfile(os.path.join(build_assets.DIST_FOLDER, filename)):
+        abort(404)
+
+    served = filename + (".br" if encoding == "br" else ".gz" if encoding == "gzip" else "")
+    response = send_from_directory(build_assets.DIST_FOLDER, served, max_age=ASSET_MAX_AGE)
+    if encoding:
+        # Content type must come from the original name, not the .br/.gz suffix
+        response.headers["Content-Encoding"] = encoding
+        response.mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    response.headers["Cache-Control"] = f"public, max-age={ASSET_MAX_AGE}, immutable"
+    response.headers["Vary"] = "Accept-Encoding"
+    return response
+
+
+# ==================== HISTORY (AUDIT LOG) ====================
+
+# Entries are appended as one JSON object per line to history/audit-<seq>.log.
+# The in-memory index only covers the kept files, so its size stays bounded.
+_history_lock = threading.Lock()
+_history = {
+    "loaded": False,
+    "next_id": 1,
+    "seq": 0,               # sequence number of the file being appended to
+    "size": 0,              # its size in bytes
+    "entries": [],          # (id, ts, action, phone, seq, offset), oldest first
+    "by_contact": {},       # phone -> [entry id]
+    "by_id": {},            # entry id -> position info tuple
+    "undone": set(),        # ids of entries that were undone
+}
+
+
+def history_path(seq):
+    return os.path.join(HISTORY_FOLDER, f"audit-{seq:06d}.log")
+
+
+def history_files():
+    """Return the sequence numbers of the history files on disk, oldest first"""
+    if not os.path.exists(HISTORY_FOLDER):
+        return []
+    return sorted(int(name[6:-4]) for name in os.listdir(HISTORY_FOLDER)
+                  if name.startswith("audit-") and name.endswith(".log"))
+
+
+def _index_history_entry(entry, seq, offset):
+    info = (entry["id"], entry["ts"], entry["action"], entry.get("phone"), seq, offset)
+    _history["entries"].append(info)
+    _history["by_id"][entry["id"]] = info
+    # An edit that changed the phone is listed under both the old and the new phone
+    for phone in {entry.get("phone"), (entry.get("before") or {}).get("phone")}:
+        if phone:
+            _history["by_contact"].setdefault(phone, []).append(entry["id"])
+    if entry["action"] == "undo":
+        _history["undone"].add(entry["undo_of"])
+
+
+def _load_history_index():
+    """Build the index from the kept history files, once per process"""
+    if _history["loaded"]:
+        return
+    os.makedirs(HISTORY_TRASH_FOLDER, exist_ok=True)
+    seqs = history_files()
+    for seq in seqs:
+        with open(history_path(seq), "rb") as f:
+            offset = 0
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    _index_history_entry(entry, seq, offset)
+                    _history["next_id"] = entry["id"] + 1
+                except (ValueError, KeyError):
+                    pass  # a torn last line from a crash is skipped
+                offset += len(line)
+    _history["seq"] = seqs[-1] if seqs else 1
+    _history["size"] = os.path.getsize(history_path(seqs[-1])) if seqs else 0
+    _history["loaded"] = True
+
+
+def _rotate_history():
+    """Start a new history file and drop the oldest ones beyond HISTORY_FILES_KEPT"""
+    _history["seq"] += 1
+    _history["size"] = 0
+    for seq in history_files()[:-HISTORY_FILES_KEPT + 1 or None]:
+        # CVs kept for undo are only reachable through their entry, remove them with it
+        with open(history_path(seq), "rb") as f:
+            for line in f:
+                try:
+                    for cv in json.loads(line).get("cvs", []):
+                        trash_path = os.path.join(HISTORY_TRASH_FOLDER, cv["trash"])
+                        if os.path.exists(trash_path):
+                            os.remove(trash_path)
+                except (ValueError, KeyError, TypeError):
+                    pass
+        os.remove(history_path(seq))
+
+    first_seq = min(history_files() + [_history["seq"]])
+    dropped = [info for info in _history["entries"] if info[4] < first_seq]
+    if dropped:
+        _history["entries"] = _history["entries"][len(dropped):]
+        oldest_kept_id = dropped[-1][0] + 1
+        for info in dropped:
+            _history["by_id"].pop(info[0], None)
+            _history["undone"].discard(info[0])
+        for phone in list(_history["by_contact"]):
+            ids = [i for i in _history["by_contact"][phone] if i >= oldest_kept_id]
+            if ids:
+                _history["by_contact"][phone] = ids
+            else:
+                del _history["by_contact"][phone]
+
+
+def log_history(action, **fields):
+    """Append one entry to the audit log and return its id"""
+    with _history_lock:
+        _load_history_index()
+        if _history["size"] >= HISTORY_MAX_BYTES:
+            _rotate_history()
+
+        entry = {"id": _history["next_id"], "ts": datetime.now().isoformat(timespec="seconds"),
+                 "action": action, **fields}
+        line = (json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+        with open(history_path(_history["seq"]), "ab") as f:
+            f.write(line)
+
+        _index_history_entry(entry, _history["seq"], _history["size"])
+        _history["size"] += len(line)
+        _history["next_id"] += 1
+        return entry["id"]
+
+
+def parse_history_time(value):
+    """Parse an ISO date or date-time filter into local time, as used by the log timestamps"""
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed
+
+
+def read_history_entries(infos):
+    """Read full entries for index tuples, one seek per entry"""
+    entries = []
+    handles = {}
+    try:
+        for info in infos:
+            seq, offset = info[4], info[5]
+            if seq not in handles:
+                handles[seq] = open(history_path(seq), "rb")
+            handles[seq].seek(offset)
+            entry = json.loads(handles[seq].readline())
+            entry["undone"] = entry["id"] in _history["undone"]
+            entries.append(entry)
+    finally:
+        for f in handles.values():
+            f.close()
+    return entries
+
+
+def trash_cv_files(full_name):
+    """Move a contact's CV files to the history trash, return [{"file", "trash"}]"""
+    safe_name = re.sub(r'[^A-Za-zΑ-Ωα-ωΆΈΊΌΎΏΉάέίόύώή0-9\s\-_]', '', full_name)
+    safe_name = safe_name.replace(' ', '_')
+
+    os.makedirs(HISTORY_TRASH_FOLDER, exist_ok=True)
+    moved = []
+    for file in os.listdir(CV_FOLDER):
+        if file.startswith(f"CV_{safe_name}_") and file.endswith(".pdf"):
+            trash_name = f"{time.time_ns()}_{file}"
+            try:
+                os.replace(os.path.join(CV_FOLDER, file), os.path.join(HISTORY_TRASH_FOLDER, trash_name))
+                moved.append({"file": file, "trash": trash_name})
+            except Exception as e:
+                print(f"Error deleting CV file {file}: {e}")
+    return moved
 
 
 # ==================== ROUTES ====================
@@ -86,19 +480,35 @@ def dashboard():
 
 @app.route("/contacts")
 def contacts_page():
-    """Contacts management page - show ALL contacts"""
+    """Contacts management page - first page of contacts, the rest load in the browser"""
+    fragment = get_cached_fragment("contacts_page", get_data_version(), render_contacts_first_page)
+    return stream_template("contacts.html", **fragment)
+
+
+def render_contacts_first_page():
+    """Render the first page of the contacts and interview tables"""
     data = load_data()
-    return render_template("contacts.html", data=data)
+    first_page = data[:PAGE_SIZE]
+    return {
+        "contact_rows": Markup(render_template("fragments/contact_rows.html", rows=first_page, start=0)),
+        "interview_rows": Markup(render_template("fragments/interview_rows.html", rows=first_page)),
+        "total": len(data),
+        "rendered": len(first_page),
+    }
 
 
 @app.route("/api/data")
 def api_data():
-    """API endpoint for ALL contacts data"""
+    """API endpoint for contacts data, ALL contacts unless offset/limit are given"""
     data = load_data()
-    return jsonify(data)
+    offset = max(request.args.get("offset", 0, type=int), 0)
+    limit = request.args.get("limit", type=int)
+    end = offset + limit if limit is not None else None
+    return jsonify(data[offset:end])
 
 
 @app.route("/add", methods=["POST"])
+@serialized_write
 def add_contact():
     """Add or edit a contact"""
     data = load_data()
@@ -132,6 +542,8 @@ def add_contact():
             if c["name"].lower() == old_name.lower() and c["phone"] == old_phone:
                 data[i] = {"name": name, "phone": phone, "location": location, "status": status}
                 save_data(data)
+                if data[i] != c:
+                    log_history("edit_contact", phone=phone, before=c, after=data[i])
                 return jsonify({"success": True})
 
     # Add new contact
@@ -141,37 +553,44 @@ def add_contact():
 
 
 @app.route("/delete", methods=["POST"])
+@concurrency_limit(1)
+@serialized_write
 def delete_contacts():
     """Delete contacts and their associated data"""
     data = load_data()
     phones_to_delete = request.json.get("phones", [])
 
-    # Delete associated CV files
-    for contact in data:
+    departments = load_departments()
+    assignments = load_assignments()
+
+    # Note the departments of each deleted contact before the assignments are dropped
+    deleted = []
+    for idx, contact in enumerate(data):
         if contact["phone"] in phones_to_delete:
-            full_name = contact["name"]
-            safe_name = re.sub(r'[^A-Za-zΑ-Ωα-ωΆΈΊΌΎΏΉάέίόύώή0-9\s\-_]', '', full_name)
-            safe_name = safe_name.replace(' ', '_')
-
-            for file in os.listdir(CV_FOLDER):
-                if file.startswith(f"CV_{safe_name}_") and file.endswith(".pdf"):
-                    try:
-                        os.remove(os.path.join(CV_FOLDER, file))
-                        print(f"Deleted CV: {file}")
-                    except Exception as e:
-                        print(f"Error deleting CV file {file}: {e}")
+            dept_names = [departments[a["dept_index"]]["name"] for a in assignments
+                          if a.get("contact_index") == idx and a.get("dept_index", len(departments)) < len(departments)]
+            deleted.append((contact, dept_names))
 
-    # Update assignments
-    assignments = load_assignments()
+    # Update assignments, renumbering contacts that come after deleted ones
     contacts_to_keep = [c for c in data if c["phone"] not in phones_to_delete]
-    phone_to_index = {c["phone"]: i for i, c in enumerate(contacts_to_keep)}
-    assignments = [a for a in assignments if a.get("contact_index") in phone_to_index.values()]
+    old_to_new_index = {}
+    for idx, contact in enumerate(data):
+        if contact["phone"] not in phones_to_delete:
+            old_to_new_index[idx] = len(old_to_new_index)
+    assignments = [a for a in assignments if a.get("contact_index") in old_to_new_index]
+    for assignment in assignments:
+        assignment["contact_index"] = old_to_new_index[assignment["contact_index"]]
     save_assignments(assignments)
 
     # Delete the contacts
     data = contacts_to_keep
     save_data(data)
 
+    # Move associated CV files to the history trash and log each deletion
+    for contact, dept_names in deleted:
+        log_history("delete_contact", phone=contact["phone"], record=contact,
+                    departments=dept_names, cvs=trash_cv_files(contact["name"]))
+
     return jsonify({"success": True})
 
 
@@ -216,6 +635,7 @@ def api_active_contacts():
 
 
 @app.route("/move_to_active", methods=["POST"])
+@serialized_write
 def move_to_active():
     """Move contact to active status"""
     data = request.json
@@ -224,16 +644,22 @@ def move_to_active():
     contacts = load_data()
 
     # Find and update the contact
+    before = None
     for contact in contacts:
         if contact["phone"] == phone:
-            contact["status"] = "active"
+            if contact.get("status") != "active":
+                before = dict(contact)
+                contact["status"] = "active"
             break
 
     save_data(contacts)
+    if before is not None:
+        log_history("edit_contact", phone=phone, before=before, after=contact)
     return jsonify({"success": True})
 
 
 @app.route("/move_to_waiting", methods=["POST"])
+@serialized_write
 def move_to_waiting():
     """Move contact to waiting status"""
     data = request.json
@@ -242,16 +668,22 @@ def move_to_waiting():
     contacts = load_data()
 
     # Find and update the contact
+    before = None
     for contact in contacts:
         if contact["phone"] == phone:
-            contact["status"] = "waiting"
+            if contact.get("status") != "waiting":
+                before = dict(contact)
+                contact["status"] = "waiting"
             break
 
     save_data(contacts)
+    if before is not None:
+        log_history("edit_contact", phone=phone, before=before, after=contact)
     return jsonify({"success": True})
 
 
 @app.route("/move_to_inactive", methods=["POST"])
+@serialized_write
 def move_to_inactive():
     """Move contact to inactive status"""
     data = request.json
@@ -260,12 +692,17 @@ def move_to_inactive():
     contacts = load_data()
 
     # Find and update the contact
+    before = None
     for contact in contacts:
         if contact["phone"] == phone:
-            contact["status"] = "inactive"
+            if contact.get("status") != "inactive":
+                before = dict(contact)
+                contact["status"] = "inactive"
             break
 
     save_data(contacts)
+    if before is not None:
+        log_history("edit_contact", phone=phone, before=before, after=contact)
     return jsonify({"success": True})
 
 
@@ -285,6 +722,7 @@ def api_departments():
 
 
 @app.route("/departments/add", methods=["POST"])
+@serialized_write
 def add_department():
     """Add or edit a department"""
     data = load_departments()
@@ -301,6 +739,8 @@ def add_department():
             if d["name"].lower() == old_name.lower():
                 data[i] = {"name": name}
                 save_departments(data)
+                if data[i] != d:
+                    log_history("edit_department", before=d, after=data[i])
                 return jsonify({"success": True})
 
     # Add new department
@@ -310,6 +750,7 @@ def add_department():
 
 
 @app.route("/departments/delete", methods=["POST"])
+@serialized_write
 def delete_department():
     """Delete departments and update assignments"""
     data = load_departments()
@@ -320,6 +761,12 @@ def delete_department():
 
     # Update assignments
     assignments = load_assignments()
+    contacts = load_data()
+    deleted = []
+    for idx in indices_to_delete:
+        phones = [contacts[a["contact_index"]]["phone"] for a in assignments
+                  if a.get("dept_index") == idx and a.get("contact_index", len(contacts)) < len(contacts)]
+        deleted.append((data[idx], phones))
     assignments = [a for a in assignments if a.get("dept_index") not in indices_to_delete]
 
     # Reindex remaining assignments for departments that come after deleted ones
@@ -335,6 +782,9 @@ def delete_department():
     data = [d for d in data if d["name"] not in names_to_delete]
     save_departments(data)
 
+    for department, phones in deleted:
+        log_history("delete_department", record=department, contacts=phones)
+
     return jsonify({"success": True})
 
 
@@ -342,15 +792,38 @@ def delete_department():
 
 @app.route("/assignments")
 def assignments_page():
-    """Assignments management page"""
-    contacts = load_data()
-    departments = load_departments()
-    return render_template("assignments.html", contacts=contacts, departments=departments)
+    """Assignments management page - dropdowns and first page of assignments, the rest load in the browser"""
+    fragment = get_cached_fragment("assignments_page", get_data_version(), render_assignments_first_page)
+    return stream_template("assignments.html", **fragment)
+
+
+def render_assignments_first_page():
+    """Render the dropdown options and the first page of the assignments table"""
+    assignments = single_flight(("assignments", get_data_version()), build_assignments_list)
+    first_page = assignments[:PAGE_SIZE]
+    return {
+        "contact_options": Markup(render_template("fragments/select_options.html",
+                                                  placeholder="Select Contact", items=load_data())),
+        "dept_options": Markup(render_template("fragments/select_options.html",
+                                               placeholder="Select Department", items=load_departments())),
+        "assignment_rows": Markup(render_template("fragments/assignment_rows.html", rows=first_page, start=0)),
+        "total": len(assignments),
+        "rendered": len(first_page),
+    }
 
 
 @app.route("/api/assignments")
 def api_assignments():
-    """API endpoint for assignments data"""
+    """API endpoint for assignments data, ALL assignments unless offset/limit are given"""
+    assignments = single_flight(("assignments", get_data_version()), build_assignments_list)
+    offset = max(request.args.get("offset", 0, type=int), 0)
+    limit = request.args.get("limit", type=int)
+    end = offset + limit if limit is not None else None
+    return jsonify(assignments[offset:end])
+
+
+def build_assignments_list():
+    """Resolve stored assignments into contact/department names"""
     assignments = load_assignments()
     contacts = load_data()
     departments = load_departments()
@@ -369,10 +842,11 @@ def api_assignments():
     # Sort by department name alphabetically
     result.sort(key=lambda x: x["department_name"].lower())
 
-    return jsonify(result)
+    return result
 
 
 @app.route("/assignments/add", methods=["POST"])
+@serialized_write
 def add_assignment():
     """Add a new assignment - supports both index-based and name-based"""
     data = request.json
@@ -425,6 +899,7 @@ def add_assignment():
 
 
 @app.route("/assignments/delete", methods=["POST"])
+@serialized_write
 def delete_assignment():
     """Delete an assignment"""
     data = request.json
@@ -442,6 +917,7 @@ def delete_assignment():
 
 
 @app.route("/assignments/add_by_name", methods=["POST"])
+@serialized_write
 def add_assignment_by_name():
     """Add assignment using contact phone and department name"""
     data = request.json
@@ -485,6 +961,7 @@ def add_assignment_by_name():
 
 
 @app.route("/assignments/delete_by_name", methods=["POST"])
+@serialized_write
 def delete_assignment_by_name():
     """Delete assignment using contact name and department name"""
     data = request.json
@@ -522,6 +999,20 @@ def delete_assignment_by_name():
 @app.route("/export")
 def export_excel():
     """Export all data to Excel file"""
+    try:
+        content = get_cached_export(get_data_version(), build_export_workbook)
+    except ServerBusy as e:
+        return busy_response(e.retry_after)
+    return send_file(
+        BytesIO(content),
+        as_attachment=True,
+        download_name=f"export_{datetime.now().strftime('%Y%m%d_%H%M')}.xlsx",
+        mimetype="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    )
+
+
+def build_export_workbook():
+    """Build the Excel export and return it as bytes"""
     contacts = load_data()
     departments = load_departments()
     assignments = load_assignments()
@@ -594,16 +1085,12 @@ def export_excel():
     # ---------------- Save to BytesIO ----------------
     file_stream = BytesIO()
     wb.save(file_stream)
-    file_stream.seek(0)
-    return send_file(
-        file_stream,
-        as_attachment=True,
-        download_name=f"export_{datetime.now().strftime('%Y%m%d_%H%M')}.xlsx",
-        mimetype="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-    )
+    return file_stream.getvalue()
 
 
 @app.route("/import", methods=["POST"])
+@concurrency_limit(1)
+@serialized_write
 def import_excel():
     """Import data from Excel file"""
     try:
@@ -639,6 +1126,7 @@ def import_excel():
 
         # Create phone to index mapping for existing contacts
         phone_to_index = {c["phone"]: idx for idx, c in enumerate(existing_contacts)}
+        originals = {}  # phone -> existing contact as it was before the import touched it
 
         name_regex = re.compile(r"^[A-Za-zΑ-Ωα-ωΆΈΊΌΎΏΉάέίόύώή ]{1,30}$")
         phone_regex = re.compile(r"^69[0-9]{8}$")
@@ -672,6 +1160,7 @@ def import_excel():
                     if phone in phone_to_index:
                         # Update existing contact
                         contact_idx = phone_to_index[phone]
+                        originals.setdefault(phone, dict(existing_contacts[contact_idx]))
                         existing_contacts[contact_idx].update({
                             "name": name,
                             "status": status,
@@ -711,12 +1200,146 @@ def import_excel():
         save_data(existing_contacts)
         save_assignments(assignments)
 
+        # Log the existing contacts the import actually changed
+        for phone, before in originals.items():
+            after = existing_contacts[phone_to_index[phone]]
+            if after != before:
+                log_history("edit_contact", phone=phone, before=before, after=after)
+
         return jsonify({"success": True, "skipped": skipped})
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
+# ==================== HISTORY ROUTES ====================
+
+@app.route("/api/history")
+def api_history():
+    """Paginated history, newest first, filterable by contact phone, action and time range"""
+    page = max(request.args.get("page", 1, type=int), 1)
+    per_page = min(max(request.args.get("per_page", 50, type=int), 1), 200)
+    phone = request.args.get("contact", "").strip()
+    action = request.args.get("action", "").strip()
+    since = request.args.get("since", "").strip()
+    until = request.args.get("until", "").strip()
+
+    # Timestamps are compared as ISO strings; a date-only "until" covers that whole day
+    try:
+        since = parse_history_time(since).isoformat(timespec="seconds") if since else ""
+        if until and len(until) == len("YYYY-MM-DD"):
+            until_end = (parse_history_time(until) + timedelta(days=1)).isoformat(timespec="seconds")
+        elif until:
+            until_end = (parse_history_time(until) + timedelta(seconds=1)).isoformat(timespec="seconds")
+        else:
+            until_end = ""
+    except ValueError:
+        return jsonify({"error": "since and until must be ISO dates or date-times"}), 400
+
+    with _history_lock:
+        _load_history_index()
+        if phone:
+            infos = [_history["by_id"][i] for i in _history["by_contact"].get(phone, [])]
+        else:
+            infos = _history["entries"]
+
+        # Entries are appended in time order, so the time range is a slice
+        timestamps = [info[1] for info in infos]
+        start = bisect.bisect_left(timestamps, since) if since else 0
+        end = bisect.bisect_left(timestamps, until_end) if until_end else len(infos)
+        infos = infos[start:end]
+        if action:
+            infos = [info for info in infos if info[2] == action]
+
+        total = len(infos)
+        newest_first = infos[::-1][(page - 1) * per_page:page * per_page]
+        entries = read_history_entries(newest_first)
+
+    return jsonify({"entries": entries, "page": page, "per_page": per_page, "total": total})
+
+
+@app.route("/api/history/undo", methods=["POST"])
+@serialized_write
+def undo_history():
+    """Restore a contact or department deleted recently, with its assignments and CVs"""
+    entry_id = request.json.get("id")
+
+    # serialized_write runs one undo at a time, so the same entry cannot be restored twice
+    with _history_lock:
+        _load_history_index()
+        info = _history["by_id"].get(entry_id)
+        if info is None:
+            return jsonify({"error": "History entry not found"}), 404
+        if entry_id in _history["undone"]:
+            return jsonify({"error": "Already undone"}), 400
+        entry = read_history_entries([info])[0]
+
+    if entry["action"] == "delete_contact":
+        error = undo_delete_contact(entry)
+    elif entry["action"] == "delete_department":
+        error = undo_delete_department(entry)
+    else:
+        return jsonify({"error": "Only deletions can be undone"}), 400
+
+    if error:
+        return jsonify({"error": error}), 400
+    log_history("undo", undo_of=entry_id, phone=entry.get("phone"))
+    return jsonify({"success": True})
+
+
+def undo_delete_contact(entry):
+    """Re-insert a deleted contact, shifting assignment indices around it"""
+    record = entry["record"]
+    contacts = load_data()
+    if any(c["phone"] == record["phone"] for c in contacts):
+        return "Phone number exists"
+
+    contacts = sorted(contacts + [record], key=lambda x: x["name"].lower())
+    position = next(i for i, c in enumerate(contacts) if c["phone"] == record["phone"])
+
+    assignments = load_assignments()
+    for a in assignments:
+        if a.get("contact_index") is not None and a["contact_index"] >= position:
+            a["contact_index"] += 1
+    dept_name_to_idx = {d["name"]: i for i, d in enumerate(load_departments())}
+    for name in entry.get("departments", []):
+        if name in dept_name_to_idx:
+            assignments.append({"contact_index": position, "dept_index": dept_name_to_idx[name]})
+
+    save_data(contacts)
+    save_assignments(assignments)
+
+    for cv in entry.get("cvs", []):
+        trash_path = os.path.join(HISTORY_TRASH_FOLDER, cv["trash"])
+        if os.path.exists(trash_path):
+            os.replace(trash_path, os.path.join(CV_FOLDER, cv["file"]))
+    return None
+
+
+def undo_delete_department(entry):
+    """Re-insert a deleted department, shifting assignment indices around it"""
+    record = entry["record"]
+    departments = load_departments()
+    if any(d["name"] == record["name"] for d in departments):
+        return "Department exists"
+
+    departments = sorted(departments + [record], key=lambda x: x["name"].lower())
+    position = next(i for i, d in enumerate(departments) if d["name"] == record["name"])
+
+    assignments = load_assignments()
+    for a in assignments:
+        if a.get("dept_index") is not None and a["dept_index"] >= position:
+            a["dept_index"] += 1
+    phone_to_idx = {c["phone"]: i for i, c in enumerate(load_data())}
+    for phone in entry.get("contacts", []):
+        if phone in phone_to_idx:
+            assignments.append({"contact_index": phone_to_idx[phone], "dept_index": position})
+
+    save_departments(departments)
+    save_assignments(assignments)
+    return None
+
+
 # ==================== CV MANAGEMENT ROUTES ====================
 
 @app.route("/contacts/upload_cv", methods=["POST"])
@@ -753,6 +1376,15 @@ def upload_cv():
 @app.route("/cv/<name>")
 def view_cv(name):
     """View CV file for a contact"""
+    path = find_cv_file(name)
+    if path:
+        return send_file(path)
+
+    return "CV not found", 404
+
+
+def find_cv_file(name):
+    """Return the path of the most recent CV file for a contact name, or None"""
     import urllib.parse
     decoded_name = urllib.parse.unquote(name)
 
@@ -768,23 +1400,27 @@ def view_cv(name):
     # Sort by date (newest first) and return the most recent
     if cv_files:
         cv_files.sort(reverse=True)
-        return send_file(os.path.join(CV_FOLDER, cv_files[0]))
+        return os.path.abspath(os.path.join(CV_FOLDER, cv_files[0]))
 
-    return "CV not found", 404
+    return None
 
 
 # ==================== APPLICATION INITIALIZATION ====================
 
-if __name__ == "__main__":
-    # Ensure required files exist
+def ensure_data_files():
+    """Create empty data files and the CV folder when they are missing"""
     for file in [CONTACTS_FILE, DEPARTMENTS_FILE, ASSIGNMENTS_FILE]:
         if not os.path.exists(file):
             with open(file, "w", encoding="utf-8") as f:
                 f.write("[]")
 
-    # Ensure CV folder exists
     if not os.path.exists(CV_FOLDER):
         os.makedirs(CV_FOLDER)
 
+
+if __name__ == "__main__":
+    # Ensure required files exist
+    ensure_data_files()
+
     # Start the application
     app.run(port=5020, debug=True)
\ No newline at end of file
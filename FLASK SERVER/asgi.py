@@ -0,0 +1,182 @@
+"""ASGI serving mode for the contacts server.
+
+Run from the FLASK SERVER folder:
+
+    pip install uvicorn a2wsgi
+    uvicorn asgi:application --port 5020
+
+Every Flask route runs unchanged in a thread pool (a2wsgi), so JSON reads and
+writes and openpyxl work never block the event loop. CV downloads and exports
+are sent by the event loop itself, so slow clients and idle keep-alive
+connections do not hold a worker thread. CV downloads keep what send_file gives
+the threaded mode: HEAD, single Range requests (206/416), ETag and
+Last-Modified with 304 responses to conditional requests.
+"""
+import asyncio
+import mimetypes
+import os
+import re
+from datetime import datetime
+from email.utils import formatdate, parsedate_to_datetime
+
+from a2wsgi import WSGIMiddleware
+
+import app as contacts_app
+
+ASGI_THREADS = int(os.environ.get("ASGI_THREADS", "16"))  # workers for Flask routes
+CHUNK_SIZE = 64 * 1024
+
+contacts_app.ensure_data_files()
+wsgi_application = WSGIMiddleware(contacts_app.app, workers=ASGI_THREADS)
+
+
+# ==================== RESPONSE HELPERS ====================
+
+async def run_blocking(func, *args):
+    """Run blocking file or openpyxl work in the default thread pool"""
+    return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+
+async def send_bytes(send, status, body, headers=()):
+    """Send a complete in-memory response"""
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-length", str(len(body)).encode())] + list(headers),
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+def parse_range(header, size):
+    """Return (start, end) for a single "bytes=" range, "invalid" if unsatisfiable, None to ignore"""
+    match = re.fullmatch(r"bytes=(\d*)-(\d*)", header.strip())
+    if not match or match.group(1) == match.group(2) == "":
+        return None  # multiple or malformed ranges are answered with the whole file
+    if size == 0:
+        return "invalid"  # an empty file has no satisfiable range, as in send_file
+    if match.group(1) == "":
+        length = int(match.group(2))
+        if length == 0:
+            return "invalid"
+        return max(size - length, 0), size - 1
+    start = int(match.group(1))
+    end = min(int(match.group(2)), size - 1) if match.group(2) else size - 1
+    if start >= size or start > end:
+        return "invalid"
+    return start, end
+
+
+def not_modified(headers, etag, mtime):
+    """True when If-None-Match or If-Modified-Since shows the client copy is current"""
+    if_none_match = headers.get(b"if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip() for tag in if_none_match.decode("latin-1").split(",")]
+        return "*" in tags or etag in tags or f"W/{etag}" in tags
+    if_modified_since = headers.get(b"if-modified-since")
+    if if_modified_since is not None:
+        try:
+            return int(mtime) <= parsedate_to_datetime(if_modified_since.decode("latin-1")).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+async def send_path(scope, send, path):
+    """Stream a file in chunks, reading each chunk off the event loop"""
+    st = await run_blocking(os.stat, path)
+    size = st.st_size
+    etag = f'"{st.st_mtime_ns:x}-{size:x}"'
+    headers = dict(scope["headers"])
+    cache_headers = [(b"etag", etag.encode()),
+                     (b"last-modified", formatdate(st.st_mtime, usegmt=True).encode()),
+                     (b"accept-ranges", b"bytes")]
+
+    if not_modified(headers, etag, st.st_mtime):
+        await send({"type": "http.response.start", "status": 304, "headers": cache_headers})
+        await send({"type": "http.response.body", "body": b""})
+        return
+
+    status, start, end = 200, 0, size - 1
+    range_header = headers.get(b"range")
+    if_range = headers.get(b"if-range")
+    if range_header and (if_range is None or if_range.decode("latin-1") == etag):
+        byte_range = parse_range(range_header.decode("latin-1"), size)
+        if byte_range == "invalid":
+            await send_bytes(send, 416, b"", cache_headers + [(b"content-range", f"bytes */{size}".encode())])
+            return
+        if byte_range:
+            status, (start, end) = 206, byte_range
+            cache_headers.append((b"content-range", f"bytes {start}-{end}/{size}".encode()))
+
+    content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", content_type.encode()),
+                    (b"content-length", str(end - start + 1).encode())] + cache_headers,
+    })
+    if scope["method"] == "HEAD":
+        await send({"type": "http.response.body", "body": b""})
+        return
+
+    f = await run_blocking(open, path, "rb")
+    try:
+        await run_blocking(f.seek, start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = await run_blocking(f.read, min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+        if remaining > 0:
+            await send({"type": "http.response.body", "body": b""})
+    finally:
+        await run_blocking(f.close)
+
+
+# ==================== NATIVE ROUTES ====================
+
+async def view_cv(scope, send):
+    """Async counterpart of app.view_cv"""
+    name = scope["path"][len("/cv/"):]
+    path = await run_blocking(contacts_app.find_cv_file, name)
+    if not path:
+        await send_bytes(send, 404, b"CV not found", [(b"content-type", b"text/html; charset=utf-8")])
+        return
+    await send_path(scope, send, path)
+
+
+async def export_excel(scope, send):
+    """Async counterpart of app.export_excel, sharing its cache and build slots"""
+    try:
+        content = await run_blocking(contacts_app.get_cached_export, contacts_app.get_data_version(),
+                                     contacts_app.build_export_workbook)
+    except contacts_app.ServerBusy as e:
+        await send_bytes(send, 429, b'{"error":"Server busy, please retry shortly"}', [
+            (b"content-type", b"application/json"),
+            (b"retry-after", str(e.retry_after).encode()),
+        ])
+        return
+
+    filename = f"export_{datetime.now().strftime('%Y%m%d_%H%M')}.xlsx"
+    await send_bytes(send, 200, content, [
+        (b"content-type", b"application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+        (b"content-disposition", f"attachment; filename={filename}".encode()),
+    ])
+
+
+async def application(scope, receive, send):
+    """ASGI entry point: file downloads on the event loop, everything else through Flask"""
+    if scope["type"] == "http" and scope["method"] in ("GET", "HEAD"):
+        path = scope["path"]
+        if path.startswith("/cv/") and len(path) > len("/cv/"):
+            return await view_cv(scope, send)
+        if path == "/export" and scope["method"] == "GET":
+            return await export_excel(scope, send)
+    return await wsgi_application(scope, receive, send)
+
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(application, port=5020)
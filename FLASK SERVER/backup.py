@@ -0,0 +1,295 @@
+"""Point-in-time snapshots and incremental backup/restore of the data folder.
+
+Run from the FLASK SERVER folder:
+
+    python backup.py snapshot [--full]    take a snapshot (incremental by default)
+    python backup.py list                 list snapshots, oldest first
+    python backup.py restore <id>         replace the data files and CVs with a snapshot
+
+A full snapshot stores every record. Incremental snapshots store only contacts
+and departments that changed since the previous snapshot, plus the new order,
+and every CV is stored once under its content hash in backups/blobs.
+Assignments are stored whole when they change, since they reference contacts
+and departments by position.
+"""
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+from datetime import datetime
+
+import app as contacts_app
+
+BACKUP_FOLDER = "backups"
+SNAPSHOT_FOLDER = os.path.join(BACKUP_FOLDER, "snapshots")
+BLOB_FOLDER = os.path.join(BACKUP_FOLDER, "blobs")
+FULL_SNAPSHOT_EVERY = 10  # start a new chain after this many incremental snapshots
+SNAPSHOT_RETRIES = 20
+
+# Collection -> (data file, record key) for collections stored as record diffs
+KEYED_COLLECTIONS = {
+    "contacts": (contacts_app.CONTACTS_FILE, "phone"),
+    "departments": (contacts_app.DEPARTMENTS_FILE, "name"),
+}
+
+
+# ==================== READING THE LIVE DATA ====================
+
+def read_json(path):
+    """Read a data file as stored, without the sorting applied by app.load_*"""
+    if not os.path.exists(path):
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cv_version():
+    """Version key for the CV folder, changes when a CV is added, replaced or removed"""
+    version = []
+    for entry in sorted(os.scandir(contacts_app.CV_FOLDER), key=lambda e: e.name):
+        st = entry.stat()
+        version.append((entry.name, st.st_mtime_ns, st.st_size))
+    return tuple(version)
+
+
+def read_state():
+    """Read a consistent state of all data files without locking out writers.
+
+    Saves replace files atomically, so each read sees a whole file. The data is
+    read again if any file changed while it was being read.
+    """
+    for _ in range(SNAPSHOT_RETRIES):
+        before = (contacts_app.get_data_version(), cv_version())
+        state = {
+            "contacts": read_json(contacts_app.CONTACTS_FILE),
+            "departments": read_json(contacts_app.DEPARTMENTS_FILE),
+            "assignments": read_json(contacts_app.ASSIGNMENTS_FILE),
+            "cvs": {entry.name: entry.path for entry in os.scandir(contacts_app.CV_FOLDER)
+                    if entry.name.endswith(".pdf")},
+        }
+        if (contacts_app.get_data_version(), cv_version()) == before:
+            state["cv_version"] = before[1]
+            return state
+        time.sleep(0.05)
+    raise RuntimeError("Data kept changing while taking the snapshot, try again")
+
+
+# ==================== SNAPSHOT STORAGE ====================
+
+def list_snapshots():
+    """Return snapshot ids, oldest first"""
+    if not os.path.exists(SNAPSHOT_FOLDER):
+        return []
+    return sorted(name[:-len(".json")] for name in os.listdir(SNAPSHOT_FOLDER) if name.endswith(".json"))
+
+
+def load_snapshot(snapshot_id):
+    path = os.path.join(SNAPSHOT_FOLDER, f"{snapshot_id}.json")
+    if not os.path.exists(path):
+        raise ValueError(f"Unknown snapshot: {snapshot_id}")
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def resolve_snapshot(snapshot_id):
+    """Rebuild the full state recorded by a snapshot by replaying its chain.
+
+    Returns (state, chain length), where state holds contacts, departments,
+    assignments, the CV index (filename -> blob hash) and the CV size/mtime
+    seen when the snapshot was taken.
+    """
+    chain = []
+    while snapshot_id:
+        snapshot = load_snapshot(snapshot_id)
+        chain.append(snapshot)
+        snapshot_id = snapshot["parent"]
+
+    state = {}
+    for snapshot in reversed(chain):
+        for name, (_, key) in KEYED_COLLECTIONS.items():
+            diff = snapshot[name]
+            by_key = {record[key]: record for record in state.get(name, [])}
+            by_key.update(diff["changed"])
+            state[name] = [by_key[k] for k in diff["order"]]
+        if snapshot["assignments"] is not None:
+            state["assignments"] = snapshot["assignments"]
+        state["cvs"] = snapshot["cvs"]
+        state["cv_stats"] = snapshot["cv_stats"]
+    return state, len(chain)
+
+
+def diff_records(records, previous, key):
+    """Return the order of keys and only the records that are new or changed"""
+    previous_by_key = {record[key]: record for record in previous}
+    return {
+        "order": [record[key] for record in records],
+        "changed": {record[key]: record for record in records if previous_by_key.get(record[key]) != record},
+    }
+
+
+def store_blob(path):
+    """Copy a CV into the blob store unless its content is already there.
+
+    Returns (content hash, whether a new blob was written).
+    """
+    digest = file_sha256(path)
+    blob_path = os.path.join(BLOB_FOLDER, f"{digest}.pdf")
+    if os.path.exists(blob_path):
+        return digest, False
+    shutil.copyfile(path, blob_path + ".tmp")
+    os.replace(blob_path + ".tmp", blob_path)
+    return digest, True
+
+
+def index_cvs(cv_paths, previous):
+    """Map CV filenames to blob hashes, hashing only files whose size or mtime changed"""
+    cvs, cv_stats, new_blobs = {}, {}, 0
+    for filename, path in sorted(cv_paths.items()):
+        st = os.stat(path)
+        stat_key = [st.st_size, st.st_mtime_ns]
+        if previous.get("cv_stats", {}).get(filename) == stat_key:
+            cvs[filename] = previous["cvs"][filename]
+        else:
+            cvs[filename], written = store_blob(path)
+            new_blobs += written
+        cv_stats[filename] = stat_key
+    return cvs, cv_stats, new_blobs
+
+
+def take_snapshot(full=False):
+    """Take a snapshot of the live data, returns (snapshot id, stats)"""
+    os.makedirs(SNAPSHOT_FOLDER, exist_ok=True)
+    os.makedirs(BLOB_FOLDER, exist_ok=True)
+
+    snapshots = list_snapshots()
+    parent_id = snapshots[-1] if snapshots and not full else None
+    previous, chain_length = resolve_snapshot(parent_id) if parent_id else ({}, 0)
+    if chain_length > FULL_SNAPSHOT_EVERY:
+        parent_id, previous = None, {}
+
+    # CVs are copied after the data files are read, so retry if one changed meanwhile
+    for _ in range(SNAPSHOT_RETRIES):
+        state = read_state()
+        cvs, cv_stats, new_blobs = index_cvs(state["cvs"], previous)
+        if cv_version() == state["cv_version"]:
+            break
+    else:
+        raise RuntimeError("CVs kept changing while taking the snapshot, try again")
+
+    snapshot = {
+        "id": datetime.now().strftime("%Y%m%d_%H%M%S_%f"),
+        "parent": parent_id,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "assignments": state["assignments"] if state["assignments"] != previous.get("assignments") else None,
+        "cvs": cvs,
+        "cv_stats": cv_stats,
+    }
+    for name, (_, key) in KEYED_COLLECTIONS.items():
+        snapshot[name] = diff_records(state[name], previous.get(name, []), key)
+
+    path = os.path.join(SNAPSHOT_FOLDER, f"{snapshot['id']}.json")
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(snapshot, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(path + ".tmp", path)
+
+    stats = {
+        "type": "incremental" if parent_id else "full",
+        "contacts_changed": len(snapshot["contacts"]["changed"]),
+        "departments_changed": len(snapshot["departments"]["changed"]),
+        "assignments_stored": snapshot["assignments"] is not None,
+        "new_cv_blobs": new_blobs,
+    }
+    return snapshot["id"], stats
+
+
+# ==================== RESTORE ====================
+
+def restore_snapshot(snapshot_id):
+    """Replace the data files and CV folder with the state recorded by a snapshot.
+
+    Nothing live is touched until every CV the snapshot needs has been copied
+    next to its target, so a missing or unreadable blob leaves the data as it was.
+    """
+    state, _ = resolve_snapshot(snapshot_id)
+    wanted = state["cvs"]
+
+    missing = sorted(filename for filename, digest in wanted.items()
+                     if not os.path.exists(os.path.join(BLOB_FOLDER, f"{digest}.pdf")))
+    if missing:
+        raise RuntimeError(f"Snapshot {snapshot_id} is missing CV blobs for: {', '.join(missing)}")
+
+    # Stage the CVs that differ from the live ones
+    staged = []
+    try:
+        for filename, digest in wanted.items():
+            target = os.path.join(contacts_app.CV_FOLDER, filename)
+            if os.path.exists(target) and file_sha256(target) == digest:
+                continue
+            staged.append(target)
+            shutil.copyfile(os.path.join(BLOB_FOLDER, f"{digest}.pdf"), target + ".tmp")
+    except BaseException:
+        for target in staged:
+            if os.path.exists(target + ".tmp"):
+                os.remove(target + ".tmp")
+        raise
+
+    for name, (path, _) in KEYED_COLLECTIONS.items():
+        contacts_app.write_json_atomic(path, state[name])
+    contacts_app.write_json_atomic(contacts_app.ASSIGNMENTS_FILE, state.get("assignments", []))
+
+    for target in staged:
+        os.replace(target + ".tmp", target)
+    for filename in os.listdir(contacts_app.CV_FOLDER):
+        if filename.endswith(".pdf") and filename not in wanted:
+            os.remove(os.path.join(contacts_app.CV_FOLDER, filename))
+
+    return {"contacts": len(state["contacts"]), "departments": len(state["departments"]),
+            "assignments": len(state.get("assignments", [])), "cvs": len(wanted)}
+
+
+# ==================== COMMAND LINE ====================
+
+def main(args):
+    if not args or args[0] not in ("snapshot", "list", "restore"):
+        print(__doc__)
+        return 1
+
+    if args[0] == "snapshot":
+        start = time.perf_counter()
+        snapshot_id, stats = take_snapshot(full="--full" in args)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"Snapshot {snapshot_id} ({stats['type']}) in {elapsed:.1f} ms: "
+              f"{stats['contacts_changed']} contacts, {stats['departments_changed']} departments changed, "
+              f"assignments {'stored' if stats['assignments_stored'] else 'unchanged'}, "
+              f"{stats['new_cv_blobs']} new CV blobs")
+
+    elif args[0] == "list":
+        for snapshot_id in list_snapshots():
+            snapshot = load_snapshot(snapshot_id)
+            print(f"{snapshot_id}  {'incremental' if snapshot['parent'] else 'full':<11}  "
+                  f"{len(snapshot['contacts']['order'])} contacts, {len(snapshot['cvs'])} CVs")
+
+    else:
+        if len(args) < 2:
+            print("Usage: python backup.py restore <id>")
+            return 1
+        start = time.perf_counter()
+        counts = restore_snapshot(args[1])
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"Restored {args[1]} in {elapsed:.1f} ms: {counts['contacts']} contacts, "
+              f"{counts['departments']} departments, {counts['assignments']} assignments, {counts['cvs']} CVs")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
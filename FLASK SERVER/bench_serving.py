@@ -0,0 +1,159 @@
+"""Compare the threaded app.run server with the ASGI serving mode.
+
+Run from the FLASK SERVER folder:  python bench_serving.py
+Both servers run against a throwaway copy of the data in a temp folder. For each
+mode it measures /api/data throughput, the latency seen by fast clients while
+slow clients download a large CV, and the server thread count during that time.
+"""
+import http.client
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+SERVER_DIR = os.path.dirname(os.path.abspath(__file__))
+PORT = 5077
+CONTACTS = 500
+CV_SIZE = 8 * 1024 * 1024
+SLOW_CLIENTS = 40
+FAST_REQUESTS = 200
+CONCURRENCY = 8
+
+MODES = {
+    "threaded app.run": [sys.executable, "-c",
+                         f"import app; app.app.run(port={PORT}, threaded=True)"],
+    "asgi (uvicorn)": [sys.executable, "-m", "uvicorn", "asgi:application",
+                       "--port", str(PORT), "--log-level", "warning"],
+}
+
+
+def prepare_data(folder):
+    """Write a dataset with many contacts and one large CV"""
+    contacts = [{"name": f"Contact {i}", "phone": f"69{i:08d}", "location": "", "status": "waiting"}
+                for i in range(CONTACTS)]
+    with open(os.path.join(folder, "data.json"), "w", encoding="utf-8") as f:
+        json.dump(contacts, f)
+    for file in ["departments.json", "assignments.json"]:
+        with open(os.path.join(folder, file), "w", encoding="utf-8") as f:
+            f.write("[]")
+    os.makedirs(os.path.join(folder, "cv_files"))
+    with open(os.path.join(folder, "cv_files", "CV_Contact_0_20250101.pdf"), "wb") as f:
+        f.write(os.urandom(CV_SIZE))
+
+
+def wait_for_server():
+    for _ in range(100):
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", PORT, timeout=1)
+            conn.request("GET", "/api/data?limit=1")
+            conn.getresponse().read()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("server did not start")
+
+
+def fetch(path):
+    conn = http.client.HTTPConnection("127.0.0.1", PORT, timeout=30)
+    start = time.perf_counter()
+    conn.request("GET", path)
+    conn.getresponse().read()
+    conn.close()
+    return time.perf_counter() - start
+
+
+def run_fast_clients():
+    """Fetch /api/data FAST_REQUESTS times from CONCURRENCY threads, return latencies"""
+    latencies = []
+    lock = threading.Lock()
+
+    def worker():
+        for _ in range(FAST_REQUESTS // CONCURRENCY):
+            elapsed = fetch("/api/data")
+            with lock:
+                latencies.append(elapsed)
+
+    threads = [threading.Thread(target=worker) for _ in range(CONCURRENCY)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return latencies, time.perf_counter() - start
+
+
+def start_slow_clients(stop):
+    """Open CV downloads that read a few bytes and then stall"""
+    socks = []
+    for _ in range(SLOW_CLIENTS):
+        # A small receive buffer, set before connecting, makes the server block on the send
+        # like a slow network would
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 16 * 1024)
+        sock.connect(("127.0.0.1", PORT))
+        sock.sendall(b"GET /cv/Contact_0 HTTP/1.1\r\nHost: localhost\r\n\r\n")
+        sock.recv(1024)
+        socks.append(sock)
+
+    def hold():
+        stop.wait()
+        for sock in socks:
+            sock.close()
+
+    threading.Thread(target=hold).start()
+
+
+def thread_count(pid):
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("Threads:"):
+                return int(line.split()[1])
+    return -1
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def bench(mode, command, folder):
+    env = dict(os.environ, PYTHONPATH=SERVER_DIR)
+    server = subprocess.Popen(command, cwd=folder, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_for_server()
+        latencies, elapsed = run_fast_clients()
+        idle_threads = thread_count(server.pid)
+
+        stop = threading.Event()
+        start_slow_clients(stop)
+        time.sleep(0.5)
+        busy_threads = thread_count(server.pid)
+        slow_latencies, _ = run_fast_clients()
+        stop.set()
+
+        print(f"{mode:<18} {FAST_REQUESTS / elapsed:>8.0f} req/s  "
+              f"p50 {percentile(latencies, 50) * 1000:>6.1f} ms  "
+              f"p95 {percentile(latencies, 95) * 1000:>6.1f} ms  "
+              f"| with {SLOW_CLIENTS} slow CV downloads: "
+              f"p95 {percentile(slow_latencies, 95) * 1000:>6.1f} ms, "
+              f"threads {idle_threads} -> {busy_threads}")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    folder = tempfile.mkdtemp()
+    try:
+        prepare_data(folder)
+        for mode, command in MODES.items():
+            bench(mode, command, folder)
+            time.sleep(0.5)
+    finally:
+        shutil.rmtree(folder)
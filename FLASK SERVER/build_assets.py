@@ -0,0 +1,167 @@
+"""Build fingerprinted, minified and precompressed static bundles.
+
+Run from the FLASK SERVER folder:  python build_assets.py
+The output goes to static/dist together with manifest.json. When the manifest
+is missing the templates fall back to the plain files in static/.
+
+Rebuilding while the server runs is safe: the manifest is swapped in atomically
+and files from the previous BUILDS_KEPT builds stay in dist, so pages that were
+already served keep finding their bundles.
+"""
+import gzip
+import hashlib
+import json
+import os
+import re
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, gzip is always produced
+    brotli = None
+
+try:
+    import rjsmin
+except ImportError:  # rjsmin is optional, without it scripts are bundled unminified
+    rjsmin = None
+
+STATIC_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+DIST_FOLDER = os.path.join(STATIC_FOLDER, "dist")
+MANIFEST_FILE = os.path.join(DIST_FOLDER, "manifest.json")
+BUILDS_FILE = os.path.join(DIST_FOLDER, "builds.json")  # files written by each recent build
+BUILDS_KEPT = 3
+
+# Bundle name -> source files (relative to static/), in load order
+BUNDLES = {
+    "base.css": ["vendor/fontawesome/css/fontawesome.min.css",
+                 "vendor/fontawesome/css/solid.min.css",
+                 "global.css"],
+    "base.js": ["global.js"],
+    "dashboard.css": ["dashboard.css"],
+    "dashboard.js": ["dashboard.js"],
+    "contacts.css": ["contacts.css"],
+    "contacts.js": ["contacts.js"],
+    "departments.css": ["departments.css"],
+    "departments.js": ["departments.js"],
+    "assignments.css": ["assignments.css"],
+    "assignments.js": ["assignments.js"],
+}
+
+COMPRESSIBLE = (".css", ".js", ".ttf", ".svg", ".json")
+
+
+# ==================== MINIFICATION ====================
+
+def minify_css(text):
+    """Strip comments and collapse whitespace in a stylesheet"""
+    text = re.sub(r"/\*.*?\*/", "", text, flags=re.S)
+    text = re.sub(r"\s+", " ", text)
+    text = re.sub(r"\s*([{};,])\s*", r"\1", text)
+    text = text.replace(";}", "}")
+    return text.strip()
+
+
+def minify_js(text):
+    """Minify a script with rjsmin, or leave it untouched when rjsmin is not installed"""
+    if rjsmin is None:
+        return text
+    return rjsmin.jsmin(text) + "\n"
+
+
+# ==================== FINGERPRINTING ====================
+
+def fingerprint(name, content):
+    """Return name with a short content hash inserted before the extension"""
+    digest = hashlib.sha256(content).hexdigest()[:12]
+    base, ext = os.path.splitext(name)
+    return f"{base}.{digest}{ext}"
+
+
+def write_file_atomic(path, content):
+    """Write bytes to a temp file and swap it in, so the server never serves a partial file"""
+    with open(path + ".tmp", "wb") as f:
+        f.write(content)
+    os.replace(path + ".tmp", path)
+
+
+def write_asset(name, content, written):
+    """Write a fingerprinted asset plus gzip/brotli variants, return its hashed name.
+
+    Every file name is added to written. Files already in dist have the same
+    content, since the name carries its hash, so they are not rewritten.
+    """
+    hashed = fingerprint(name, content)
+    variants = {hashed: lambda: content}
+    if hashed.endswith(COMPRESSIBLE):
+        variants[hashed + ".gz"] = lambda: gzip.compress(content, compresslevel=9, mtime=0)
+        if brotli is not None:
+            variants[hashed + ".br"] = lambda: brotli.compress(content)
+
+    for filename, compress in variants.items():
+        path = os.path.join(DIST_FOLDER, filename)
+        if not os.path.exists(path):
+            write_file_atomic(path, compress())
+        written.add(filename)
+    return hashed
+
+
+def prune_old_builds(written):
+    """Record this build's files and delete those no longer used by the last BUILDS_KEPT builds"""
+    builds = []
+    if os.path.exists(BUILDS_FILE):
+        with open(BUILDS_FILE, "r", encoding="utf-8") as f:
+            builds = json.load(f)
+    builds = (builds + [sorted(written)])[-BUILDS_KEPT:]
+    keep = {name for build_files in builds for name in build_files}
+    keep.update({os.path.basename(MANIFEST_FILE), os.path.basename(BUILDS_FILE)})
+
+    for filename in os.listdir(DIST_FOLDER):
+        if filename not in keep:
+            os.remove(os.path.join(DIST_FOLDER, filename))
+    write_file_atomic(BUILDS_FILE, json.dumps(builds, indent=4).encode("utf-8"))
+
+
+def rewrite_css_urls(text, source, written):
+    """Copy files referenced by url() into dist with hashed names and point the CSS at them"""
+    source_dir = os.path.dirname(os.path.join(STATIC_FOLDER, source))
+
+    def replace(match):
+        url = match.group(1).strip("'\"")
+        if url.startswith(("data:", "http:", "https:", "/", "#")):
+            return match.group(0)
+        path = os.path.normpath(os.path.join(source_dir, url.split("?")[0].split("#")[0]))
+        with open(path, "rb") as f:
+            hashed = write_asset(os.path.basename(path), f.read(), written)
+        return f"url({hashed})"
+
+    return re.sub(r"url\(([^)]+)\)", replace, text)
+
+
+def build():
+    """Build every bundle, write the manifest and prune files of older builds"""
+    os.makedirs(DIST_FOLDER, exist_ok=True)
+
+    manifest = {}
+    written = set()
+    for bundle, sources in BUNDLES.items():
+        parts = []
+        for source in sources:
+            with open(os.path.join(STATIC_FOLDER, source), "r", encoding="utf-8") as f:
+                text = f.read()
+            if bundle.endswith(".css"):
+                parts.append(minify_css(rewrite_css_urls(text, source, written)))
+            else:
+                parts.append(minify_js(text))
+
+        separator = "\n" if bundle.endswith(".css") else ";\n"
+        content = separator.join(parts).encode("utf-8")
+        manifest[bundle] = write_asset(bundle, content, written)
+
+        original = sum(os.path.getsize(os.path.join(STATIC_FOLDER, s)) for s in sources)
+        print(f"{bundle:<18} {original:>8} -> {len(content):>8} bytes  {manifest[bundle]}")
+
+    write_file_atomic(MANIFEST_FILE, json.dumps(manifest, indent=4).encode("utf-8"))
+    prune_old_builds(written)
+
+
+if __name__ == "__main__":
+    build()
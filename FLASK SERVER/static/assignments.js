@@ -4,21 +4,34 @@ const deptSelect = document.getElementById('deptSelect');
 const assignBtn = document.getElementById('assignBtn');
 const tbody = document.querySelector('#assignmentsTable tbody');
 
-async function loadAssignments() {
-    // First refresh assignments to ensure consistency
-    await fetch('/api/assignments/refresh');
+function appendAssignmentRow(a, idx) {
+    const tr = document.createElement('tr');
+    tr.innerHTML = `<td>${idx+1}</td>
+                    <td>${a.contact_name}</td>
+                    <td>${a.department_name}</td>
+                    <td><button class="deleteBtn" data-index="${idx}">❌ Delete</button></td>`;
+    tbody.appendChild(tr);
+}
 
+async function loadAssignments() {
     const res = await fetch('/api/assignments');
     const data = await res.json();
     tbody.innerHTML = '';
-    data.forEach((a, idx) => {
-        const tr = document.createElement('tr');
-        tr.innerHTML = `<td>${idx+1}</td>
-                        <td>${a.contact_name}</td>
-                        <td>${a.department_name}</td>
-                        <td><button class="deleteBtn" data-index="${idx}">❌ Delete</button></td>`;
-        tbody.appendChild(tr);
-    });
+    data.forEach((a, idx) => appendAssignmentRow(a, idx));
+}
+
+// Rows for the first page come rendered from the server, only fetch the missing ones
+async function loadRemainingAssignments() {
+    const page = window.assignmentsPage || {total: 0, rendered: 0};
+    if (page.rendered >= page.total) return;
+
+    try {
+        const res = await fetch(`/api/assignments?offset=${page.rendered}`);
+        const data = await res.json();
+        data.forEach((a, idx) => appendAssignmentRow(a, page.rendered + idx));
+    } catch (err) {
+        console.error(err);
+    }
 }
 
 async function refreshDropdowns() {
@@ -91,8 +104,8 @@ tbody.addEventListener('click', async e => {
 
 // Refresh everything when page loads
 document.addEventListener('DOMContentLoaded', function() {
-    refreshDropdowns();
-    loadAssignments();
+    // Dropdowns are already rendered by the server
+    loadRemainingAssignments();
 
     // Add event listener to refresh assignments when returning to this page
     document.addEventListener('visibilitychange', function() {
@@ -4,7 +4,7 @@ const COMPANY_COORDINATES = { lat: 40.84313201523982, lng: 22.895167239425863 };
 console.log("Contacts JavaScript loaded");
 
 // DOM Elements
-let tbody, addBtn, deleteBtn, selectAll, searchInput, modal, nameInput, phoneInput, locationInput, saveBtn, cancelBtn, errorMsg, cvFileInput;
+let tbody, interviewBody, addBtn, deleteBtn, selectAll, searchInput, modal, nameInput, phoneInput, locationInput, saveBtn, cancelBtn, errorMsg, cvFileInput;
 
 let editingContact = null;
 let currentCVPhone = null;
@@ -33,11 +33,12 @@ document.addEventListener('DOMContentLoaded', function() {
     initializeInterviewData();
     bindInterviewEvents();
     bindContactEvents();
-    reloadDataAndRender();
+    loadRemainingContacts();
 });
 
 function initializeDOMElements() {
     tbody = document.querySelector('#contactsTable tbody');
+    interviewBody = document.querySelector('#interviewTable tbody');
     addBtn = document.getElementById('addContactBtn');
     deleteBtn = document.getElementById('deleteSelectedBtn');
     selectAll = document.getElementById('selectAll');
@@ -62,20 +63,11 @@ function initializeDOMElements() {
 // INTERVIEW TRACKING FUNCTIONS
 function initializeInterviewData() {
     try {
-        const contacts = window.contactsData || [];
-        console.log("Initializing interview data for", contacts.length, "contacts");
-
-        contacts.forEach(contact => {
-            if (!interviewData[contact.phone]) {
-                interviewData[contact.phone] = {
-                    progress: 0,
-                    rating: '3', // Default to 3 stars
-                    stars: '⭐⭐⭐',
-                    notes: '',
-                    scheduledDate: null
-                };
-            }
-        });
+        const phones = Array.from(document.querySelectorAll('#interviewTable tbody tr[data-phone]'))
+            .map(row => row.dataset.phone);
+        console.log("Initializing interview data for", phones.length, "contacts");
+
+        phones.forEach(ensureInterviewData);
         saveInterviewData();
         renderInterviewData();
     } catch (error) {
@@ -83,6 +75,18 @@ function initializeInterviewData() {
     }
 }
 
+function ensureInterviewData(phone) {
+    if (!interviewData[phone]) {
+        interviewData[phone] = {
+            progress: 0,
+            rating: '3', // Default to 3 stars
+            stars: '⭐⭐⭐',
+            notes: '',
+            scheduledDate: null
+        };
+    }
+}
+
 function saveInterviewData() {
     localStorage.setItem('interviewData', JSON.stringify(interviewData));
 }
@@ -138,33 +142,35 @@ function renderInterviewData() {
 function bindInterviewEvents() {
     console.log("Binding interview events");
 
-    // Timeline Interaction
-    document.querySelectorAll('.interview-timeline').forEach(timeline => {
-        timeline.addEventListener('click', function(e) {
-            if (e.target.classList.contains('timeline-marker')) return;
+    if (!interviewBody) return;
 
-            const rect = this.getBoundingClientRect();
-            const clickX = e.clientX - rect.left;
-            const percentage = (clickX / rect.width) * 100;
-            const progress = Math.max(0, Math.min(100, percentage));
+    // Rows are appended after load, so all row events are delegated to the table body
 
-            const phone = this.dataset.phone;
-            if (interviewData[phone]) {
-                interviewData[phone].progress = progress;
-            }
+    // Timeline Interaction
+    interviewBody.addEventListener('click', function(e) {
+        const timeline = e.target.closest('.interview-timeline');
+        if (!timeline || e.target.classList.contains('timeline-marker')) return;
 
-            const progressBar = this.querySelector('.timeline-progress');
-            const marker = this.querySelector('.timeline-marker');
-            if (progressBar) progressBar.style.width = progress + '%';
-            if (marker) marker.style.left = progress + '%';
+        const rect = timeline.getBoundingClientRect();
+        const clickX = e.clientX - rect.left;
+        const percentage = (clickX / rect.width) * 100;
+        const progress = Math.max(0, Math.min(100, percentage));
 
-            saveInterviewData();
-        });
+        const phone = timeline.dataset.phone;
+        if (interviewData[phone]) {
+            interviewData[phone].progress = progress;
+        }
 
+        const progressBar = timeline.querySelector('.timeline-progress');
         const marker = timeline.querySelector('.timeline-marker');
-        if (marker) {
-            marker.addEventListener('mousedown', startDrag);
-        }
+        if (progressBar) progressBar.style.width = progress + '%';
+        if (marker) marker.style.left = progress + '%';
+
+        saveInterviewData();
+    });
+
+    interviewBody.addEventListener('mousedown', function(e) {
+        if (e.target.classList.contains('timeline-marker')) startDrag(e);
     });
 
     // Close dropdowns when clicking anywhere else on the page
@@ -186,10 +192,11 @@ document.addEventListener('keydown', function(e) {
 });
 
     // Rating Dropdown - SIMPLE VERSION
-document.querySelectorAll('.rating-display').forEach(display => {
-    display.addEventListener('click', function(e) {
+interviewBody.addEventListener('click', function(e) {
+    const display = e.target.closest('.rating-display');
+    if (display) {
         e.stopPropagation();
-        const dropdown = this.parentElement;
+        const dropdown = display.parentElement;
         const options = dropdown.querySelector('.rating-options');
 
         // Close all other open dropdowns
@@ -205,16 +212,16 @@ document.querySelectorAll('.rating-display').forEach(display => {
         } else {
             options.style.display = 'flex';
         }
-    });
-});
+        return;
+    }
 
-document.querySelectorAll('.rating-option').forEach(option => {
-    option.addEventListener('click', function() {
-        const dropdown = this.closest('.rating-dropdown');
+    const option = e.target.closest('.rating-option');
+    if (option) {
+        const dropdown = option.closest('.rating-dropdown');
         const row = dropdown.closest('tr');
         const phone = row.dataset.phone;
-        const rating = this.dataset.rating;
-        const stars = this.dataset.stars;
+        const rating = option.dataset.rating;
+        const stars = option.dataset.stars;
 
         interviewData[phone].rating = rating;
         interviewData[phone].stars = stars;
@@ -247,7 +254,7 @@ document.querySelectorAll('.rating-option').forEach(option => {
 
         dropdown.querySelector('.rating-options').style.display = 'none';
         saveInterviewData();
-    });
+    }
 });
 
 // Close dropdowns when clicking outside
@@ -269,31 +276,31 @@ document.addEventListener('keydown', function(e) {
 });
 
     // Schedule Interview
-    document.querySelectorAll('.scheduleBtn').forEach(btn => {
-        btn.addEventListener('click', function() {
-            const phone = this.dataset.phone;
-            const row = this.closest('tr');
-            const contactName = row.querySelector('td:first-child').textContent;
-
-            document.getElementById('scheduleContactName').value = contactName;
-            document.getElementById('scheduleModal').classList.add('open');
-            document.getElementById('scheduleModal').dataset.currentPhone = phone;
-        });
+    interviewBody.addEventListener('click', function(e) {
+        const btn = e.target.closest('.scheduleBtn');
+        if (!btn) return;
+        const phone = btn.dataset.phone;
+        const row = btn.closest('tr');
+        const contactName = row.querySelector('td:first-child').textContent;
+
+        document.getElementById('scheduleContactName').value = contactName;
+        document.getElementById('scheduleModal').classList.add('open');
+        document.getElementById('scheduleModal').dataset.currentPhone = phone;
     });
 
     // Notes Button
-    document.querySelectorAll('.notesBtn').forEach(btn => {
-        btn.addEventListener('click', function() {
-            const phone = this.dataset.phone;
-            const row = this.closest('tr');
-            const contactName = row.querySelector('td:first-child').textContent;
-            const data = interviewData[phone];
-
-            document.getElementById('notesContactName').value = contactName;
-            document.getElementById('interviewNotes').value = data?.notes || '';
-            document.getElementById('notesModal').classList.add('open');
-            document.getElementById('notesModal').dataset.currentPhone = phone;
-        });
+    interviewBody.addEventListener('click', function(e) {
+        const btn = e.target.closest('.notesBtn');
+        if (!btn) return;
+        const phone = btn.dataset.phone;
+        const row = btn.closest('tr');
+        const contactName = row.querySelector('td:first-child').textContent;
+        const data = interviewData[phone];
+
+        document.getElementById('notesContactName').value = contactName;
+        document.getElementById('interviewNotes').value = data?.notes || '';
+        document.getElementById('notesModal').classList.add('open');
+        document.getElementById('notesModal').dataset.currentPhone = phone;
     });
 
     // Save Schedule
@@ -595,6 +602,12 @@ function bindContactEvents() {
                     headers: {'Content-Type': 'application/json'},
                     body: JSON.stringify({phones})
                 });
+                if(r.status === 429) {
+                    // Another delete is running, nothing was deleted
+                    const wait = r.headers.get('Retry-After') || 2;
+                    alert(`Server busy, please retry the delete in ${wait} seconds`);
+                    return;
+                }
                 if(r.ok) await reloadDataAndRender();
             } catch(err) {
                 console.error(err);
@@ -758,14 +771,9 @@ async function updateDistanceDisplay(distanceElement, contactLocation) {
     }
 }
 
-async function reloadDataAndRender() {
-    try {
-        const res = await fetch('/api/data');
-        const data = await res.json();
-        tbody.innerHTML = '';
-        data.forEach((c, idx) => {
-            const tr = document.createElement('tr');
-            tr.innerHTML = `
+function appendContactRow(c, idx) {
+    const tr = document.createElement('tr');
+    tr.innerHTML = `
         <td><input type="checkbox" class="rowCheckbox"></td>
         <td>c${idx+1}</td>
         <td>
@@ -784,11 +792,84 @@ async function reloadDataAndRender() {
             <button class="mapBtn" data-location="${escapeHtml(c.location || '')}">📍 Map</button>
             <div class="distance-display">Calculating...</div>
         </td>`;
-            tbody.appendChild(tr);
+    tbody.appendChild(tr);
+
+    const distanceElement = tr.querySelector('.distance-display');
+    updateDistanceDisplay(distanceElement, c.location || '');
+}
+
+function appendInterviewRow(c) {
+    const phone = escapeHtml(c.phone);
+    const tr = document.createElement('tr');
+    tr.dataset.phone = c.phone;
+    tr.innerHTML = `
+        <td style="text-align:left; padding-left:18px;">${escapeHtml(c.name)}</td>
+        <td>
+            <div class="interview-timeline" data-phone="${phone}">
+                <div class="timeline-progress"></div>
+                <div class="timeline-marker" style="left: 0%;"></div>
+            </div>
+            <button class="scheduleBtn" data-phone="${phone}">📅 Schedule</button>
+        </td>
+        <td>
+            <div class="rating-dropdown">
+                <div class="rating-display">
+                    <span class="rating-stars">⭐⭐⭐</span>
+                    <span>3 Stars</span>
+                </div>
+                <div class="rating-options">
+                    <div class="rating-option" data-rating="1" data-stars="⭐"><span>⭐</span><span>1 Star - Poor</span></div>
+                    <div class="rating-option" data-rating="2" data-stars="⭐⭐"><span>⭐⭐</span><span>2 Stars - Fair</span></div>
+                    <div class="rating-option" data-rating="3" data-stars="⭐⭐⭐"><span>⭐⭐⭐</span><span>3 Stars - Good</span></div>
+                    <div class="rating-option" data-rating="4" data-stars="⭐⭐⭐⭐"><span>⭐⭐⭐⭐</span><span>4 Stars - Very Good</span></div>
+                    <div class="rating-option" data-rating="5" data-stars="⭐⭐⭐⭐⭐"><span>⭐⭐⭐⭐⭐</span><span>5 Stars - Excellent</span></div>
+                </div>
+            </div>
+        </td>
+        <td>
+            <button class="notesBtn" data-phone="${phone}">📝 Notes</button>
+        </td>`;
+    interviewBody.appendChild(tr);
+    ensureInterviewData(c.phone);
+}
+
+// Rows for the first page come rendered from the server, only fetch what is missing
+async function loadRemainingContacts() {
+    tbody.querySelectorAll('tr').forEach(tr => {
+        const mapBtn = tr.querySelector('.mapBtn');
+        updateDistanceDisplay(tr.querySelector('.distance-display'), mapBtn ? mapBtn.dataset.location : '');
+    });
+
+    const page = window.contactsPage || {total: 0, rendered: 0};
+    if (page.rendered >= page.total) return;
 
-            const distanceElement = tr.querySelector('.distance-display');
-            updateDistanceDisplay(distanceElement, c.location || '');
+    try {
+        const res = await fetch(`/api/data?offset=${page.rendered}`);
+        const data = await res.json();
+        data.forEach((c, idx) => {
+            appendContactRow(c, page.rendered + idx);
+            appendInterviewRow(c);
+        });
+        saveInterviewData();
+        renderInterviewData();
+        console.log("Loaded remaining contacts:", data.length);
+    } catch (error) {
+        console.error("Error loading remaining contacts:", error);
+    }
+}
+
+async function reloadDataAndRender() {
+    try {
+        const res = await fetch('/api/data');
+        const data = await res.json();
+        tbody.innerHTML = '';
+        interviewBody.innerHTML = '';
+        data.forEach((c, idx) => {
+            appendContactRow(c, idx);
+            appendInterviewRow(c);
         });
+        saveInterviewData();
+        renderInterviewData();
 
         console.log("Data reloaded and rendered:", data.length, "contacts");
     } catch (error) {